@@ -52,7 +52,7 @@ def extract_hex(lines: str, symbol: str, expected_bytes: int) -> Optional[str]:
 
 def read_json_key_iv(path: Path) -> Optional[Tuple[str, str]]:
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = json.loads(path.read_bytes())
     except OSError as exc:
         print(f"{path}: failed to read ({exc})", file=sys.stderr)
         return None
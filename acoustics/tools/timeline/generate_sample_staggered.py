@@ -14,8 +14,20 @@ from __future__ import annotations
 
 import argparse
 import json
+import math
+import os
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, Iterator, List, Set, Tuple
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional speedup
+    ijson = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 
 
 SCRIPT_PATH = Path(__file__).resolve()
@@ -29,6 +41,27 @@ DEFAULT_OUTPUT = (
     / "examples"
     / "sample_staggered.json"
 )
+PLAY_ADDRESS = "/acoustics/play"
+WRITE_BUFFER_SIZE = 1 << 20
+EVENT_BATCH_SIZE = 4096
+# Registries at least this large are streamed with ijson; smaller ones parse
+# faster in one shot.
+STREAM_REGISTRY_BYTES = 64 << 20
+
+# Parsed registries keyed by (resolved path, st_mtime_ns, st_size).
+_device_cache: Dict[Tuple[str, int, int], List[str]] = {}
+
+
+def _loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
 
 
 def parse_args() -> argparse.Namespace:
@@ -88,24 +121,48 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+def _iter_registry_entries(devices_path: Path, size: int) -> Iterator[Any]:
+    """Yield the top-level entries of the registry, streaming large files with ijson."""
+    if ijson is None or size < STREAM_REGISTRY_BYTES:
+        payload = _loads(devices_path.read_bytes())
+        if not isinstance(payload, list):
+            raise ValueError(f"{devices_path} must contain a JSON list")
+        yield from payload
+        return
+
+    with devices_path.open("rb") as handle:
+        try:
+            events = ijson.parse(handle, use_float=True)
+            if next(events, None) != ("", "start_array", None):
+                raise ValueError(f"{devices_path} must contain a JSON list")
+            yield from ijson.items(events, "item")
+        except ijson.JSONError as exc:
+            raise ValueError(f"{devices_path}: invalid JSON ({exc})") from exc
+
+
 def load_device_ids(devices_path: Path) -> List[str]:
-    payload = json.loads(devices_path.read_text(encoding="utf-8"))
-    if not isinstance(payload, list):
-        raise ValueError(f"{devices_path} must contain a JSON list")
+    stat = devices_path.stat()
+    cache_key = (str(devices_path.resolve()), stat.st_mtime_ns, stat.st_size)
+    cached = _device_cache.get(cache_key)
+    if cached is not None:
+        return list(cached)
 
     device_ids: List[str] = []
-    for entry in payload:
+    seen: Set[str] = set()
+    for entry in _iter_registry_entries(devices_path, stat.st_size):
         if not isinstance(entry, dict):
             continue
         device_id = entry.get("id") or entry.get("device_id") or entry.get("alias")
         if not device_id:
             continue
-        if device_id not in device_ids:
+        if device_id not in seen:
+            seen.add(device_id)
             device_ids.append(device_id)
 
     if not device_ids:
         raise ValueError(f"No device IDs found in {devices_path}")
-    return device_ids
+    _device_cache[cache_key] = device_ids
+    return list(device_ids)
 
 
 def build_events(
@@ -116,27 +173,26 @@ def build_events(
     passes: int,
     start_offset: float,
 ) -> List[dict]:
+    for name, value in (("gain", gain), ("spacing", spacing), ("start_offset", start_offset)):
+        if not math.isfinite(value):
+            raise ValueError(f"{name} must be a finite number")
     if spacing <= 0:
         raise ValueError("spacing must be > 0")
     if passes < 1:
         raise ValueError("passes must be >= 1")
 
-    events: List[dict] = []
-    sequence_length = len(device_ids)
-
-    for pass_index in range(passes):
-        for index, device_id in enumerate(device_ids):
-            position = (pass_index * sequence_length) + index
-            offset = round(start_offset + position * spacing, 6)
-            events.append(
-                {
-                    "offset": offset,
-                    "address": "/acoustics/play",
-                    "targets": [device_id],
-                    "args": [preset, 0, gain, 0],
-                }
-            )
-    return events
+    # Every event carries the same play arguments; share one immutable tuple.
+    play_args = (preset, 0, gain, 0)
+    targets = device_ids * passes
+    return [
+        {
+            "offset": round(start_offset + position * spacing, 6),
+            "address": PLAY_ADDRESS,
+            "targets": [device_id],
+            "args": play_args,
+        }
+        for position, device_id in enumerate(targets)
+    ]
 
 
 def build_timeline(
@@ -148,6 +204,8 @@ def build_timeline(
     start_offset: float,
     lead_time: float,
 ) -> dict:
+    if not math.isfinite(lead_time):
+        raise ValueError("lead_time must be a finite number")
     events = build_events(
         device_ids=device_ids,
         preset=preset,
@@ -180,6 +238,34 @@ def build_timeline(
     }
 
 
+def write_timeline(timeline: dict, output: Path) -> None:
+    """Write the timeline JSON, encoding events in fixed-size batches.
+
+    The file is assembled next to ``output`` and only moved into place once
+    every event has been encoded, so a failure never leaves a partial timeline.
+    """
+    header = {key: value for key, value in timeline.items() if key != "events"}
+    events = timeline["events"]
+    partial = output.with_name(f".{output.name}.partial")
+    try:
+        with partial.open("wb", buffering=WRITE_BUFFER_SIZE) as handle:
+            # Drop the closing "\n}" of the header so the events array can follow.
+            handle.write(_dumps(header)[:-2])
+            handle.write(b',\n  "events": [')
+            separator = b"\n  "
+            for start in range(0, len(events), EVENT_BATCH_SIZE):
+                encoded = _dumps(events[start : start + EVENT_BATCH_SIZE])
+                # Strip the batch's own "[\n" / "\n]" and nest its items one level.
+                handle.write(separator)
+                handle.write(encoded[2:-2].replace(b"\n", b"\n  "))
+                separator = b",\n  "
+            handle.write(b"\n  ]\n}\n")
+        os.replace(partial, output)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+
+
 def main() -> None:
     args = parse_args()
     device_ids = load_device_ids(args.devices)
@@ -194,7 +280,7 @@ def main() -> None:
     )
 
     args.output.parent.mkdir(parents=True, exist_ok=True)
-    args.output.write_text(json.dumps(timeline, indent=2) + "\n", encoding="utf-8")
+    write_timeline(timeline, args.output)
     print(
         f"Wrote timeline for {len(device_ids)} device(s) "
         f"({args.passes} pass(es)) to {args.output}"
@@ -68,8 +68,7 @@ def parse_args() -> argparse.Namespace:
 
 
 def load_json(path: pathlib.Path) -> Dict[str, Any]:
-    with path.open("r", encoding="utf-8") as fh:
-        return json.load(fh)
+    return json.loads(path.read_bytes())
 
 
 def parse_iso8601(value: str) -> dt.datetime: